@@ -42,7 +42,7 @@ export async function POST(request: NextRequest) {
 
             if (isConnectionError) {
                 return NextResponse.json(
-                    { error: "Detection backend is not running. Please start the Python server: cd backend && ../backend/venv/bin/python server.py" },
+                    { error: "Detection backend is not running. Please start the Python server: python -m backend.server (from the repository root)" },
                     { status: 503 }
                 )
             }
@@ -0,0 +1 @@
+# Empty init file to make backend a package
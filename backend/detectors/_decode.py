@@ -0,0 +1,92 @@
+"""
+Shared image decoding for the detectors.
+
+JPEG decoding is a large share of per-image CPU time, so the pipeline decodes
+each upload once into a DecodedImage and hands it to every detector instead
+of letting each one call cv2.imdecode / Image.open on the raw bytes again.
+"""
+
+import io
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from PIL import Image
+
+
+@dataclass
+class DecodedImage:
+    """One decoded image in the layouts the detectors need."""
+
+    bgr_u8: np.ndarray   # HxWx3 uint8, OpenCV channel order
+    rgb_u8: np.ndarray   # HxWx3 uint8
+    gray_u8: np.ndarray  # HxW uint8 (BT.601 luma)
+    exif_bytes: bytes    # Raw EXIF block, b"" if the file has none
+
+    def exif(self) -> Image.Exif:
+        """Parsed EXIF tags (empty mapping if the file has none)."""
+        exif = Image.Exif()
+        if self.exif_bytes:
+            exif.load(self.exif_bytes)
+        return exif
+
+
+def decode(image_bytes: bytes) -> DecodedImage:
+    """
+    Decode image bytes once. Raises ValueError if the data is not an image.
+    """
+    bgr = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+
+    if bgr is None:
+        # Formats OpenCV can't read (e.g. some GIFs) — fall back to PIL
+        try:
+            rgb = np.asarray(Image.open(io.BytesIO(image_bytes)).convert("RGB"))
+        except Exception:
+            raise ValueError("Could not decode image")
+        bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    else:
+        rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+    return DecodedImage(
+        bgr_u8=bgr,
+        rgb_u8=rgb,
+        gray_u8=cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY),
+        exif_bytes=read_exif_bytes(image_bytes),
+    )
+
+
+def read_exif_bytes(image_bytes: bytes) -> bytes:
+    """
+    Raw EXIF block of an image, or b"" if it has none.
+    JPEGs are scanned for the APP1 segment directly; other formats go
+    through PIL, which only parses the container headers.
+    """
+    if image_bytes[:2] == b"\xff\xd8":
+        return _jpeg_exif_segment(image_bytes)
+    try:
+        return Image.open(io.BytesIO(image_bytes)).info.get("exif", b"")
+    except Exception:
+        return b""
+
+
+def _jpeg_exif_segment(data: bytes) -> bytes:
+    """Walk JPEG markers up to the scan data and return the EXIF APP1 payload."""
+    pos = 2
+    n = len(data)
+    while pos + 4 <= n:
+        if data[pos] != 0xFF:
+            break  # Corrupt marker stream
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1  # Fill byte
+            continue
+        if marker in (0xD9, 0xDA):
+            break  # EOI / start of scan — no metadata past this point
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            pos += 2  # Standalone markers carry no length
+            continue
+        length = int.from_bytes(data[pos + 2:pos + 4], "big")
+        if marker == 0xE1 and data[pos + 4:pos + 10] == b"Exif\x00\x00":
+            return bytes(data[pos + 4:pos + 2 + length])
+        pos += 2 + length
+    return b""
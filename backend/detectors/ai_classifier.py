@@ -13,95 +13,297 @@ downgrade the verdict to "suspicious".
 """
 
 import os
-import io
+import tempfile
+import time
+import threading
+from concurrent.futures import Future
 import numpy as np
 import cv2
 from PIL import Image
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from torchvision import transforms
+
+from ._decode import DecodedImage, decode
 
 # ---- Globals (loaded once) ----
 _model = None
+_model_lock = threading.Lock()
 _device = torch.device("cpu")
-_face_cascade = None
+# Haar cascades aren't thread-safe; each detector thread gets its own
+_local = threading.local()
+
+# Torch's default threadpool sizing suits one big job, not many concurrent
+# small ones. DT_TORCH_THREADS=N pins intra-op threads to N (1 is usually
+# best for a busy server) and inter-op threads to 1.
+_torch_threads = os.environ.get("DT_TORCH_THREADS")
+if _torch_threads:
+    torch.set_num_threads(int(_torch_threads))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Inter-op pool already started by another import
+
+# Micro-batching: concurrent requests are coalesced into one forward pass
+MAX_BATCH_SIZE = 8
+BATCH_WINDOW_S = 0.010
+_batch_pending = []  # (input_tensor, Future) pairs awaiting inference
+_batch_cond = threading.Condition()
+_batch_worker = None
 
-MODEL_PATH = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-    "models", "ffpp_c23.pth"
+MODELS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models"
 )
+MODEL_PATH = os.path.join(MODELS_DIR, "ffpp_c23.pth")
 
-# Standard preprocessing (matches FaceForensics++ training exactly)
-_transform = transforms.Compose([
-    transforms.Resize((299, 299)),
-    transforms.ToTensor(),
-    transforms.Normalize(mean=[0.5, 0.5, 0.5], std=[0.5, 0.5, 0.5]),
-])
+# int8 model is cached here after the first calibration run
+QUANTIZED_MODEL_PATH = os.path.join(MODELS_DIR, "ffpp_c23_int8.pt")
+# Drop ~20 sample photos (ideally faces) here to enable int8 quantization
+CALIBRATION_DIR = os.path.join(MODELS_DIR, "calibration")
+CALIBRATION_SAMPLES = 20
+
+# XceptionNet input size (FaceForensics++ training)
+INPUT_SIZE = 299
 
 
 def _load_model():
-    """Load the XceptionNet model once (lazy init)."""
+    """Load the XceptionNet model once (lazy init, thread-safe)."""
     global _model
     if _model is not None:
         return _model
 
-    import sys
-    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    if backend_dir not in sys.path:
-        sys.path.insert(0, backend_dir)
-
-    from network.xception import Xception
-
-    model = Xception(num_classes=2)
-    checkpoint = torch.load(MODEL_PATH, map_location=_device, weights_only=False)
-    new_state_dict = {}
-    for k, v in checkpoint.items():
-        new_key = k.replace("model.", "", 1) if k.startswith("model.") else k
-        new_state_dict[new_key] = v
-    model.load_state_dict(new_state_dict, strict=True)
-    model.eval()
-    model.to(_device)
-    _model = model
-    print(f"[AI Classifier] XceptionNet loaded from {MODEL_PATH}")
+    with _model_lock:
+        if _model is None:
+            _model = _build_model()
     return _model
 
 
+def _build_model():
+    """Build XceptionNet: int8 if available, TorchScript-compiled and warmed up."""
+    from ..network.xception import Xception
+
+    model = None
+    if os.path.exists(QUANTIZED_MODEL_PATH) and _quant_engine():
+        try:
+            torch.backends.quantized.engine = _quant_engine()
+            model = torch.jit.load(QUANTIZED_MODEL_PATH, map_location=_device)
+            model.eval()
+            loaded_from = QUANTIZED_MODEL_PATH
+        except Exception as e:
+            print(f"[AI Classifier] Cached int8 model unusable, rebuilding from FP32: {e}")
+            model = None
+
+    if model is None:
+        model = Xception(num_classes=2)
+        checkpoint = torch.load(MODEL_PATH, map_location=_device, weights_only=False)
+        new_state_dict = {}
+        for k, v in checkpoint.items():
+            new_key = k.replace("model.", "", 1) if k.startswith("model.") else k
+            new_state_dict[new_key] = v
+        model.load_state_dict(new_state_dict, strict=True)
+        model.eval()
+        model.to(_device)
+        loaded_from = MODEL_PATH
+
+        try:
+            quantized = _quantize_model(model)
+        except Exception as e:
+            print(f"[AI Classifier] int8 quantization failed, using FP32 model: {e}")
+            quantized = None
+        if quantized is not None:
+            model = quantized
+            loaded_from = QUANTIZED_MODEL_PATH
+
+    # TorchScript + freeze folds BatchNorm into the convs and strips the
+    # per-op Python dispatch; fall back to eager mode if scripting fails.
+    try:
+        scripted = torch.jit.freeze(torch.jit.script(model))
+        # The JIT profiler only settles on its optimized graph after a
+        # couple of runs — pay that here instead of on the first request.
+        dummy = torch.zeros(1, 3, INPUT_SIZE, INPUT_SIZE, device=_device)
+        with torch.inference_mode():
+            for _ in range(2):
+                scripted(dummy)
+        model = scripted
+    except Exception as e:
+        print(f"[AI Classifier] TorchScript compile failed, using eager model: {e}")
+
+    print(f"[AI Classifier] XceptionNet loaded from {loaded_from}")
+    return model
+
+
+def _quant_engine():
+    """int8 backend for this CPU: fbgemm on x86, qnnpack on ARM."""
+    engines = torch.backends.quantized.supported_engines
+    for engine in ("fbgemm", "qnnpack"):
+        if engine in engines:
+            return engine
+    return None
+
+
+def _quantize_model(model: nn.Module):
+    """
+    Post-training static int8 quantization of XceptionNet.
+
+    Calibrates activation ranges on face crops from CALIBRATION_DIR, then
+    converts conv + linear layers to int8.
+    The scripted result is cached to QUANTIZED_MODEL_PATH so calibration
+    only runs once. Returns None when no calibration images are available —
+    quantizing with made-up ranges would wreck accuracy.
+    """
+    engine = _quant_engine()
+    if _device.type != "cpu" or engine is None or not os.path.isdir(CALIBRATION_DIR):
+        return None
+
+    samples = []
+    for name in sorted(os.listdir(CALIBRATION_DIR)):
+        if len(samples) >= CALIBRATION_SAMPLES:
+            break
+        try:
+            img = Image.open(os.path.join(CALIBRATION_DIR, name)).convert("RGB")
+        except Exception:
+            continue  # Not an image
+        samples.append(_to_input_tensor(_crop_face(np.asarray(img))))
+
+    if not samples:
+        return None
+
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    torch.backends.quantized.engine = engine
+    prepared = prepare_fx(
+        model, get_default_qconfig_mapping(engine), example_inputs=(samples[0],)
+    )
+    with torch.no_grad():
+        for sample in samples:
+            prepared(sample)
+    quantized = torch.jit.script(convert_fx(prepared))
+    print(f"[AI Classifier] int8 model calibrated on {len(samples)} images ({engine})")
+
+    # Several workers may calibrate at once: write to a temp file and swap it
+    # in atomically so nobody ever loads a half-written model
+    fd, tmp_path = tempfile.mkstemp(dir=MODELS_DIR, suffix=".pt.tmp")
+    os.close(fd)
+    try:
+        torch.jit.save(quantized, tmp_path)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates it owner-only
+        os.replace(tmp_path, QUANTIZED_MODEL_PATH)
+        print(f"[AI Classifier] int8 model cached to {QUANTIZED_MODEL_PATH}")
+    except Exception as e:
+        print(f"[AI Classifier] Could not cache int8 model: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return quantized
+
+
+def _infer_batched(input_tensor: torch.Tensor) -> torch.Tensor:
+    """
+    Queue an Nx3x299x299 input for the batching worker and block until its
+    N softmax rows ([real, fake]) come back.
+    """
+    global _batch_worker
+    future = Future()
+    with _batch_cond:
+        if _batch_worker is None:
+            _batch_worker = threading.Thread(
+                target=_batch_loop, name="xception-batcher", daemon=True
+            )
+            _batch_worker.start()
+        _batch_pending.append((input_tensor, future))
+        _batch_cond.notify()
+    return future.result()
+
+
+def _batch_loop():
+    """
+    Worker thread: wait for the first pending input, give concurrent callers
+    up to BATCH_WINDOW_S to join, then run them as one batch and scatter the
+    probability rows back to their futures.
+    """
+    global _batch_pending
+    while True:
+        with _batch_cond:
+            while not _batch_pending:
+                _batch_cond.wait()
+            deadline = time.monotonic() + BATCH_WINDOW_S
+            while len(_batch_pending) < MAX_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                _batch_cond.wait(remaining)
+            batch = _batch_pending[:MAX_BATCH_SIZE]
+            _batch_pending = _batch_pending[MAX_BATCH_SIZE:]
+
+        tensors = [t for t, _ in batch]
+        futures = [f for _, f in batch]
+        try:
+            model = _load_model()
+            with torch.inference_mode():
+                logits = model(torch.cat(tensors).to(_device))
+                probs = F.softmax(logits, dim=1).cpu()
+            start = 0
+            for tensor, future in batch:
+                end = start + tensor.shape[0]
+                future.set_result(probs[start:end])
+                start = end
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+
+
+def _to_input_tensor(face_crop: np.ndarray) -> torch.Tensor:
+    """
+    Resize an RGB uint8 face crop to 1x3x299x299 and normalize to [-1, 1].
+    Same as the training Resize + ToTensor + Normalize(mean=0.5, std=0.5).
+    The resize stays on PIL's bilinear filter: crops are mostly enlarged,
+    and the model is sensitive to any other resampling.
+    """
+    arr = np.array(Image.fromarray(face_crop).resize((INPUT_SIZE, INPUT_SIZE), Image.BILINEAR))
+    t = torch.from_numpy(arr).permute(2, 0, 1).contiguous().float()
+    t.sub_(127.5).div_(127.5)
+    return t.unsqueeze(0)
+
+
 def _get_face_cascade():
-    """Get OpenCV Haar cascade for face detection."""
-    global _face_cascade
-    if _face_cascade is None:
+    """Get this thread's OpenCV Haar cascade for face detection."""
+    cascade = getattr(_local, "face_cascade", None)
+    if cascade is None:
         cascade_path = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-        _face_cascade = cv2.CascadeClassifier(cascade_path)
-    return _face_cascade
+        cascade = _local.face_cascade = cv2.CascadeClassifier(cascade_path)
+    return cascade
 
 
-def _crop_face(image: Image.Image, margin: float = 0.3) -> Image.Image:
+def _crop_face(
+    rgb_u8: np.ndarray, margin: float = 0.3, faces: Optional[List[Tuple[int, int, int, int]]] = None
+) -> np.ndarray:
     """
-    Detect and crop the largest face from the image.
+    Detect and crop the largest face from an RGB uint8 image.
     Uses a quadratic bounding box with margin (matches FaceForensics++ style).
+    Pass `faces` as (x, y, w, h) boxes to reuse an earlier detection pass.
+    Returns a view into `rgb_u8` (no copy).
     """
-    img_array = np.array(image)
-    gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+    img_h, img_w = rgb_u8.shape[:2]
 
-    cascade = _get_face_cascade()
-    faces = cascade.detectMultiScale(
-        gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30),
-        flags=cv2.CASCADE_SCALE_IMAGE,
-    )
+    if faces is None:
+        gray = cv2.cvtColor(rgb_u8, cv2.COLOR_RGB2GRAY)
+
+        cascade = _get_face_cascade()
+        faces = cascade.detectMultiScale(
+            gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30),
+            flags=cv2.CASCADE_SCALE_IMAGE,
+        )
 
     if len(faces) == 0:
-        w, h = image.size
-        min_dim = min(w, h)
-        left = (w - min_dim) // 2
-        top = (h - min_dim) // 2
-        return image.crop((left, top, left + min_dim, top + min_dim))
+        min_dim = min(img_w, img_h)
+        left = (img_w - min_dim) // 2
+        top = (img_h - min_dim) // 2
+        return rgb_u8[top:top + min_dim, left:left + min_dim]
 
     faces = sorted(faces, key=lambda f: f[2] * f[3], reverse=True)
     x, y, w, h = faces[0]
-    img_h, img_w = img_array.shape[:2]
     size = int(max(w, h) * (1.0 + 2 * margin))
     cx, cy = x + w // 2, y + h // 2
     x1 = max(0, cx - size // 2)
@@ -109,10 +311,10 @@ def _crop_face(image: Image.Image, margin: float = 0.3) -> Image.Image:
     x2 = min(img_w, x1 + size)
     y2 = min(img_h, y1 + size)
     side = min(x2 - x1, y2 - y1)
-    return image.crop((x1, y1, x1 + side, y1 + side))
+    return rgb_u8[y1:y1 + side, x1:x1 + side]
 
 
-def _check_exif(image: Image.Image) -> dict:
+def _check_exif(exif_data: Image.Exif) -> dict:
     """
     Check EXIF metadata to determine if image came from a real camera.
     
@@ -124,7 +326,6 @@ def _check_exif(image: Image.Image) -> dict:
     This is the most reliable cross-validation signal because it's
     impossible for a GAN to produce authentic camera EXIF data.
     """
-    exif_data = image.getexif()
     
     if not exif_data:
         return {
@@ -191,7 +392,11 @@ def _check_exif(image: Image.Image) -> dict:
     }
 
 
-def classify_deepfake(image_bytes: bytes) -> Dict[str, Any]:
+def classify_deepfake(
+    image_bytes: Union[bytes, List[bytes]],
+    decoded: Optional[Union[DecodedImage, List[Optional[DecodedImage]]]] = None,
+    faces: Optional[List] = None,
+) -> Dict[str, Any]:
     """
     Classify an image as real or deepfake.
     
@@ -202,29 +407,47 @@ def classify_deepfake(image_bytes: bytes) -> Dict[str, Any]:
     - XceptionNet says fake AND no camera EXIF → FAKE
     - XceptionNet says fake BUT has camera EXIF → likely false positive → REAL
     - XceptionNet says real → REAL
+
+    Pass `decoded` to reuse an image the pipeline has already decoded, and
+    `faces` as (x, y, w, h) boxes in its pixel coordinates (e.g. from
+    detect_faces) to skip a second face detection pass.
+
+    `image_bytes` may also be a list of frames from one video, with
+    `decoded` and `faces` as matching per-frame lists. The frames go through
+    XceptionNet as one batch and their scores are averaged; `frame_index`
+    in the result points at the most suspicious frame.
     """
     try:
-        model = _load_model()
-        raw_img = Image.open(io.BytesIO(image_bytes))
-        
-        # Check EXIF BEFORE converting (conversion strips EXIF)
-        exif_info = _check_exif(raw_img)
-        
-        img = raw_img.convert("RGB")
-        original_size = img.size
+        _load_model()
+        is_batch = isinstance(image_bytes, list)
+        if not is_batch:
+            image_bytes, decoded, faces = [image_bytes], [decoded], [faces]
+        n_frames = len(image_bytes)
+        if not n_frames:
+            raise ValueError("No frames to classify")
+        decoded = [
+            image if image is not None else decode(data)
+            for data, image in zip(image_bytes, decoded or [None] * n_frames)
+        ]
+        faces = faces or [None] * n_frames
+
+        # Frames of one upload share its metadata
+        exif_info = _check_exif(decoded[0].exif())
 
         # 1. Face detection and cropping
-        face_img = _crop_face(img)
-        face_size = face_img.size
+        face_crops = [_crop_face(image.rgb_u8, faces=boxes) for image, boxes in zip(decoded, faces)]
+
+        # 2. XceptionNet inference (one batch for all frames)
+        probs = _infer_batched(torch.cat([_to_input_tensor(crop) for crop in face_crops]))
+        frame_index = int(probs[:, 1].argmax())
 
-        # 2. XceptionNet inference
-        input_tensor = _transform(face_img).unsqueeze(0).to(_device)
-        with torch.no_grad():
-            logits = model(input_tensor)
-            probs = F.softmax(logits, dim=1)[0]
+        xception_real = float(probs[:, 0].mean())
+        xception_fake = float(probs[:, 1].mean())
 
-        xception_real = float(probs[0])
-        xception_fake = float(probs[1])
+        img_h, img_w = decoded[frame_index].rgb_u8.shape[:2]
+        original_size = (img_w, img_h)
+        face_crop = face_crops[frame_index]
+        face_size = (face_crop.shape[1], face_crop.shape[0])
 
         # 3. Combine XceptionNet + EXIF cross-validation
         details = []
@@ -271,8 +494,13 @@ def classify_deepfake(image_bytes: bytes) -> Dict[str, Any]:
             f"Face crop: {face_size[0]}x{face_size[1]} from "
             f"{original_size[0]}x{original_size[1]}"
         )
+        if is_batch:
+            details.append(
+                f"Fake score per frame: "
+                f"{', '.join(f'{p * 100:.1f}%' for p in probs[:, 1].tolist())}"
+            )
 
-        return {
+        result = {
             "success": True,
             "label": label,
             "confidence": round(confidence, 4),
@@ -287,6 +515,10 @@ def classify_deepfake(image_bytes: bytes) -> Dict[str, Any]:
             },
             "details": details,
         }
+        if is_batch:
+            result["frame_index"] = frame_index
+            result["frame_count"] = n_frames
+        return result
 
     except Exception as e:
         import traceback
@@ -10,47 +10,48 @@ This is used by actual forensic investigators to detect Photoshop edits,
 face swaps, and other image tampering.
 """
 
-import io
+import cv2
 import numpy as np
-from PIL import Image
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from ._decode import DecodedImage, decode
 
-def analyze_ela(image_bytes: bytes, quality: int = 90) -> Dict[str, Any]:
+
+def analyze_ela(
+    image_bytes: bytes, quality: int = 90, decoded: Optional[DecodedImage] = None
+) -> Dict[str, Any]:
     """
     Perform Error Level Analysis on an image.
     Returns manipulation score and heatmap data.
+    Pass `decoded` to reuse an image the pipeline has already decoded.
     """
     try:
-        original = Image.open(io.BytesIO(image_bytes))
-
-        # Convert to RGB if needed
-        if original.mode != "RGB":
-            original = original.convert("RGB")
-
-        width, height = original.size
-
-        # Re-save at known JPEG quality
-        buffer = io.BytesIO()
-        original.save(buffer, format="JPEG", quality=quality)
-        buffer.seek(0)
-        resaved = Image.open(buffer)
+        if decoded is None:
+            decoded = decode(image_bytes)
+        orig_arr = decoded.bgr_u8
 
-        # Compute pixel-level difference
-        orig_arr = np.array(original, dtype=np.float64)
-        resaved_arr = np.array(resaved, dtype=np.float64)
+        height, width = orig_arr.shape[:2]
 
-        # Absolute difference
-        diff = np.abs(orig_arr - resaved_arr)
+        # Re-save at known JPEG quality (libjpeg-turbo via OpenCV).
+        # The round-trip stays in the pixel domain: coefficient readers
+        # (jpegio, torchjpeg) need a file path, and a DCT-domain diff skips
+        # the colour-conversion/chroma rounding that ELA actually measures.
+        ok, jpg_bytes = cv2.imencode(".jpg", orig_arr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise ValueError("JPEG re-encode failed")
+        resaved_arr = cv2.imdecode(jpg_bytes, cv2.IMREAD_COLOR)
 
-        # Scale to 0-255 for visibility
-        ela_image = (diff * (255.0 / diff.max())).astype(np.uint8) if diff.max() > 0 else diff.astype(np.uint8)
+        # Absolute pixel-level difference (uint8 SAD, no float64 copies)
+        diff = cv2.absdiff(orig_arr, resaved_arr)
 
         # Compute overall manipulation score
         # Higher mean difference = more likely manipulated
-        mean_diff = float(np.mean(diff))
-        std_diff = float(np.std(diff))
-        max_diff = float(np.max(diff))
+        mean_diff = float(diff.mean(dtype=np.float32))
+        std_diff = float(diff.std(dtype=np.float32))
+        max_diff = float(diff.max())
+
+        # Scale to 0-255 for visibility (fused multiply + saturating cast)
+        ela_image = cv2.convertScaleAbs(diff, alpha=(255.0 / max_diff) if max_diff > 0 else 1.0)
 
         # Normalized manipulation score (0 = likely authentic, 1 = likely manipulated)
         # Typical authentic images have low, uniform ELA
@@ -90,39 +91,36 @@ def analyze_ela(image_bytes: bytes, quality: int = 90) -> Dict[str, Any]:
 
 def _generate_heatmap_from_ela(
     ela_image: np.ndarray, rows: int = 8, cols: int = 12
-) -> list:
+) -> np.ndarray:
     """
     Divide the ELA image into a grid and compute average intensity per cell.
-    Returns normalized 0-1 values matching the frontend heatmap format.
+    Returns normalized 0-1 values matching the frontend heatmap format, as a
+    rows x cols array (the response serializer encodes NumPy directly).
     """
     h, w = ela_image.shape[:2]
 
-    # Convert to grayscale if needed
+    # Convert to grayscale if needed (BT.601 luma; ELA image is BGR)
     if len(ela_image.shape) == 3:
-        gray = np.mean(ela_image, axis=2)
+        gray = cv2.cvtColor(ela_image, cv2.COLOR_BGR2GRAY)
     else:
-        gray = ela_image.astype(np.float64)
+        gray = ela_image
 
     cell_h = h // rows
     cell_w = w // cols
 
-    heatmap = []
     max_val = gray.max() if gray.max() > 0 else 1.0
 
-    for i in range(rows):
-        row = []
-        for j in range(cols):
-            y1 = i * cell_h
-            y2 = (i + 1) * cell_h if i < rows - 1 else h
-            x1 = j * cell_w
-            x2 = (j + 1) * cell_w if j < cols - 1 else w
+    # Cell edges; the last row/column absorbs the remainder pixels
+    ys = np.append(np.arange(rows) * cell_h, h)
+    xs = np.append(np.arange(cols) * cell_w, w)
 
-            cell = gray[y1:y2, x1:x2]
-            avg = float(np.mean(cell)) / max_val if cell.size > 0 else 0.0
-            row.append(round(avg, 4))
-        heatmap.append(row)
+    # Per-cell sums in one vectorized pass, then divide by cell areas
+    row_sums = np.add.reduceat(gray, ys[:-1], axis=0, dtype=np.float64)
+    sums = np.add.reduceat(row_sums, xs[:-1], axis=1)
+    counts = np.outer(np.diff(ys), np.diff(xs))
+    cells = np.where(counts > 0, sums / np.maximum(counts, 1), 0.0) / max_val
 
-    return heatmap
+    return np.round(cells, 4)
 
 
 def _detect_artifacts(ela_image: np.ndarray, original: np.ndarray) -> list:
@@ -132,21 +130,7 @@ def _detect_artifacts(ela_image: np.ndarray, original: np.ndarray) -> list:
     """
     artifacts = []
 
-    if len(ela_image.shape) == 3:
-        gray = np.mean(ela_image, axis=2)
-    else:
-        gray = ela_image.astype(np.float64)
-
-    mean = np.mean(gray)
-    std = np.std(gray)
-
-    if std < 1.0:
-        return artifacts  # Very uniform, likely authentic
-
-    # Threshold for anomalous regions (2 standard deviations above mean)
-    threshold = mean + 2 * std
-
-    h, w = gray.shape
+    h, w = ela_image.shape[:2]
 
     # Check named facial regions (approximate locations)
     regions = [
@@ -157,11 +141,16 @@ def _detect_artifacts(ela_image: np.ndarray, original: np.ndarray) -> list:
         ("Right face boundary", (w * 3 // 4, 0, w, h)),
     ]
 
-    for name, (x1, y1, x2, y2) in regions:
-        region = gray[y1:y2, x1:x2]
-        region_mean = float(np.mean(region))
+    mean, std, region_means = _region_stats(ela_image, [box for _, box in regions])
+
+    if std < 1.0:
+        return artifacts  # Very uniform, likely authentic
+
+    # Threshold for anomalous regions (2 standard deviations above mean)
+    threshold = mean + 2 * std
 
-        if region_mean > threshold:
+    for (name, _), region_mean in zip(regions, region_means):
+        if region_mean is not None and region_mean > threshold:
             severity = min(1.0, (region_mean - mean) / (3 * std))
             artifacts.append({
                 "region": name,
@@ -169,3 +158,38 @@ def _detect_artifacts(ela_image: np.ndarray, original: np.ndarray) -> list:
             })
 
     return artifacts
+
+
+def _region_stats(ela_image: np.ndarray, regions: list) -> tuple:
+    """
+    Global mean/std of the channel-averaged ELA image plus the mean of each
+    (x1, y1, x2, y2) region, all from a single integral-image pass.
+    Region means are None for empty regions.
+    """
+    if len(ela_image.shape) == 3:
+        # Exact channel sum in uint16; the stats are divided back down below
+        channels = cv2.split(ela_image)
+        total = channels[0]
+        for channel in channels[1:]:
+            total = cv2.add(total, channel, dtype=cv2.CV_16U)
+        scale = float(len(channels))
+    else:
+        total = ela_image
+        scale = 1.0
+
+    sums, sq_sums = cv2.integral2(total, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+    h, w = total.shape
+    n = h * w
+    mean = sums[h, w] / n
+    std = np.sqrt(max(sq_sums[h, w] / n - mean * mean, 0.0))
+
+    region_means = []
+    for x1, y1, x2, y2 in regions:
+        area = (x2 - x1) * (y2 - y1)
+        if area <= 0:
+            region_means.append(None)
+            continue
+        region_sum = sums[y2, x2] - sums[y1, x2] - sums[y2, x1] + sums[y1, x1]
+        region_means.append(float(region_sum / area / scale))
+
+    return float(mean / scale), float(std / scale), region_means
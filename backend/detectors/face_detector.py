@@ -4,32 +4,83 @@ Uses a pre-trained Caffe model for robust face detection.
 Falls back to Haar cascade if DNN model is unavailable.
 """
 
+import threading
+
 import cv2
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from ._decode import DecodedImage, decode
+
+# ---- Per-thread detector objects ----
+# CascadeClassifier.detectMultiScale and dnn.Net.setInput/forward keep
+# per-call state inside the object, so sharing one across the detector
+# threads corrupts it. Each thread loads its own copy once.
+_local = threading.local()
 
 
-def detect_faces(image_bytes: bytes) -> Dict[str, Any]:
+def detect_faces(image_bytes: bytes, decoded: Optional[DecodedImage] = None) -> Dict[str, Any]:
     """
     Detect faces in an image using OpenCV.
     Returns face count, bounding boxes, and confidence scores.
+    Pass `decoded` to reuse an image the pipeline has already decoded.
     """
     # Decode image
-    nparr = np.frombuffer(image_bytes, np.uint8)
-    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    if decoded is None:
+        try:
+            decoded = decode(image_bytes)
+        except ValueError:
+            return {
+                "face_count": 0,
+                "faces": [],
+                "detection_method": "none",
+                "error": "Could not decode image",
+            }
+    img = decoded.bgr_u8
+
+    # Try DNN-based face detection first (more accurate)
+    return _face_result(img, _detect_faces_dnn([img])[0])
 
-    if img is None:
-        return {
-            "face_count": 0,
-            "faces": [],
-            "detection_method": "none",
-            "error": "Could not decode image",
-        }
 
+def detect_faces_batch(
+    images: List[bytes], decoded: Optional[List[Optional[DecodedImage]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Detect faces in several images (e.g. frames of one video).
+    The DNN detector runs all of them in a single forward pass; images where
+    it finds nothing fall back to Haar cascades one by one.
+    Returns one detect_faces-style result per image.
+    """
+    if decoded is None:
+        decoded = [None] * len(images)
+
+    results = [None] * len(images)
+    imgs = []
+    for i, (image_bytes, image) in enumerate(zip(images, decoded)):
+        if image is None:
+            try:
+                image = decode(image_bytes)
+            except ValueError:
+                results[i] = {
+                    "face_count": 0,
+                    "faces": [],
+                    "detection_method": "none",
+                    "error": "Could not decode image",
+                }
+                continue
+        imgs.append((i, image.bgr_u8))
+
+    dnn_faces = _detect_faces_dnn([img for _, img in imgs])
+    for (i, img), faces in zip(imgs, dnn_faces):
+        results[i] = _face_result(img, faces)
+    return results
+
+
+def _face_result(img: np.ndarray, dnn_faces: List[Dict]) -> Dict[str, Any]:
+    """Result dict for one image, falling back to Haar cascade if DNN found nothing."""
     height, width = img.shape[:2]
 
-    # Try DNN-based face detection first (more accurate)
-    faces = _detect_faces_dnn(img, width, height)
+    faces = dnn_faces
     method = "dnn"
 
     # Fallback to Haar cascade if DNN finds nothing
@@ -45,32 +96,33 @@ def detect_faces(image_bytes: bytes) -> Dict[str, Any]:
     }
 
 
-def _detect_faces_dnn(img: np.ndarray, width: int, height: int) -> List[Dict]:
-    """Use OpenCV DNN face detector (Caffe model)."""
-    faces = []
+def _detect_faces_dnn(imgs: List[np.ndarray]) -> List[List[Dict]]:
+    """Use OpenCV DNN face detector (Caffe model) on a batch of images."""
+    faces = [[] for _ in imgs]
+    if not imgs:
+        return faces
 
     try:
-        # Use OpenCV's built-in DNN face detector
-        # Create blob from image
-        blob = cv2.dnn.blobFromImage(
-            cv2.resize(img, (300, 300)), 1.0, (300, 300), (104.0, 177.0, 123.0)
-        )
+        # Load the net first so we skip the blob work when it's unavailable
+        net = _get_dnn_net()
 
-        # Load pre-trained model
-        proto_path = cv2.data.haarcascades  # We'll use this path as reference
-        # Use the DNN face detector that comes with OpenCV samples
-        net = cv2.dnn.readNetFromCaffe(
-            _get_prototxt_content(), _get_model_path()
+        # One blob (and forward pass) for the whole batch
+        blob = cv2.dnn.blobFromImages(
+            [cv2.resize(img, (300, 300)) for img in imgs],
+            1.0, (300, 300), (104.0, 177.0, 123.0),
         )
         net.setInput(blob)
         detections = net.forward()
 
-        for i in range(detections.shape[2]):
-            confidence = float(detections[0, 0, i, 2])
+        # Each row: [image_id, label, confidence, x1, y1, x2, y2] (relative)
+        for detection in detections[0, 0]:
+            confidence = float(detection[2])
             if confidence > 0.5:
-                box = detections[0, 0, i, 3:7] * np.array([width, height, width, height])
+                index = int(detection[0])
+                height, width = imgs[index].shape[:2]
+                box = detection[3:7] * np.array([width, height, width, height])
                 x1, y1, x2, y2 = box.astype("int")
-                faces.append({
+                faces[index].append({
                     "bbox": {"x": int(x1), "y": int(y1), "w": int(x2 - x1), "h": int(y2 - y1)},
                     "confidence": round(confidence, 4),
                 })
@@ -85,16 +137,8 @@ def _detect_faces_haar(img: np.ndarray) -> List[Dict]:
     faces = []
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
-    # Use OpenCV's built-in Haar cascade for face detection
-    cascade_path = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-    face_cascade = cv2.CascadeClassifier(cascade_path)
-
-    # Also try profile face detection
-    profile_cascade_path = cv2.data.haarcascades + "haarcascade_profileface.xml"
-    profile_cascade = cv2.CascadeClassifier(profile_cascade_path)
-
     # Detect frontal faces
-    detected = face_cascade.detectMultiScale(
+    detected = _get_frontal().detectMultiScale(
         gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
     )
 
@@ -112,7 +156,7 @@ def _detect_faces_haar(img: np.ndarray) -> List[Dict]:
 
     # If no frontal faces, try profile faces
     if not faces:
-        detected = profile_cascade.detectMultiScale(
+        detected = _get_profile().detectMultiScale(
             gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
         )
         for x, y, w, h in detected:
@@ -128,6 +172,35 @@ def _detect_faces_haar(img: np.ndarray) -> List[Dict]:
     return faces
 
 
+def _get_frontal():
+    """Get this thread's frontal-face Haar cascade (parsed once per thread)."""
+    frontal = getattr(_local, "frontal", None)
+    if frontal is None:
+        cascade_path = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        frontal = _local.frontal = cv2.CascadeClassifier(cascade_path)
+    return frontal
+
+
+def _get_profile():
+    """Get this thread's profile-face Haar cascade (parsed once per thread)."""
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        cascade_path = cv2.data.haarcascades + "haarcascade_profileface.xml"
+        profile = _local.profile = cv2.CascadeClassifier(cascade_path)
+    return profile
+
+
+def _get_dnn_net():
+    """Get this thread's DNN face detector (Caffe model), loaded once per thread."""
+    net = getattr(_local, "dnn_net", None)
+    if net is None:
+        # Use the DNN face detector that comes with OpenCV samples
+        net = _local.dnn_net = cv2.dnn.readNetFromCaffe(
+            _get_prototxt_content(), _get_model_path()
+        )
+    return net
+
+
 def _get_prototxt_content():
     """Returns path to DNN prototxt - will fail gracefully if not available."""
     raise FileNotFoundError("DNN model not available, using Haar cascade")
@@ -9,36 +9,35 @@ GAN-generated images have distinctive frequency-domain artifacts:
 This module performs DCT (Discrete Cosine Transform) analysis to detect these patterns.
 """
 
+import cv2
 import numpy as np
-from scipy.fft import dctn
-from PIL import Image
-import io
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from ._decode import DecodedImage, decode
 
-def analyze_frequency(image_bytes: bytes) -> Dict[str, Any]:
+
+def analyze_frequency(image_bytes: bytes, decoded: Optional[DecodedImage] = None) -> Dict[str, Any]:
     """
     Perform frequency domain analysis on an image.
     Returns anomaly scores and spectral data.
+    Pass `decoded` to reuse an image the pipeline has already decoded.
     """
     try:
-        img = Image.open(io.BytesIO(image_bytes))
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-
-        img_arr = np.array(img, dtype=np.float64)
+        if decoded is None:
+            decoded = decode(image_bytes)
 
-        # Convert to grayscale for frequency analysis
-        gray = np.mean(img_arr, axis=2)
+        # Grayscale for frequency analysis (BT.601 luma)
+        gray = decoded.gray_u8
 
-        # Resize to standard size for consistent analysis
-        from PIL import Image as PILImage
-        gray_img = PILImage.fromarray(gray.astype(np.uint8), mode="L")
-        gray_img = gray_img.resize((256, 256), PILImage.Resampling.LANCZOS)
-        gray = np.array(gray_img, dtype=np.float64)
+        # Resize to standard size for consistent analysis. INTER_AREA only
+        # when shrinking: enlarging with it is nearest-neighbour, whose step
+        # edges add exactly the high-frequency energy scored below
+        shrinking = gray.shape[0] >= 256 and gray.shape[1] >= 256
+        interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_CUBIC
+        gray = cv2.resize(gray, (256, 256), interpolation=interpolation).astype(np.float32)
 
-        # Compute 2D DCT
-        dct_result = dctn(gray, type=2, norm="ortho")
+        # Compute 2D DCT (OpenCV's DCT-II is orthonormal, same as norm="ortho")
+        dct_result = cv2.dct(gray)
 
         # Analyze frequency distribution
         magnitude = np.abs(dct_result)
@@ -118,17 +117,8 @@ def _detect_periodicity(magnitude: np.ndarray) -> float:
     col_profile = np.mean(magnitude, axis=1)
 
     # Compute autocorrelation to detect periodicity
-    row_ac = np.correlate(row_profile - np.mean(row_profile),
-                          row_profile - np.mean(row_profile), mode="full")
-    row_ac = row_ac[len(row_ac) // 2:]
-    if row_ac[0] > 0:
-        row_ac /= row_ac[0]
-
-    col_ac = np.correlate(col_profile - np.mean(col_profile),
-                          col_profile - np.mean(col_profile), mode="full")
-    col_ac = col_ac[len(col_ac) // 2:]
-    if col_ac[0] > 0:
-        col_ac /= col_ac[0]
+    row_ac = _autocorrelation(row_profile)
+    col_ac = _autocorrelation(col_profile)
 
     # Look for peaks in autocorrelation (indicates periodicity)
     # Skip the first few samples (trivial correlation)
@@ -138,7 +128,22 @@ def _detect_periodicity(magnitude: np.ndarray) -> float:
     return float(max(row_peaks, col_peaks))
 
 
-def _generate_waveform(magnitude: np.ndarray) -> list:
+def _autocorrelation(x: np.ndarray) -> np.ndarray:
+    """
+    Normalized autocorrelation of a 1D profile for lags 0..N-1.
+    Computed via FFT (Wiener-Khinchin), zero-padded to 2N so the result
+    matches the linear np.correlate(x, x, "full") in O(N log N).
+    """
+    x = x - np.mean(x)
+    n = len(x)
+    f = np.fft.rfft(x, 2 * n)
+    ac = np.fft.irfft(f * np.conj(f), 2 * n)[:n]
+    if ac[0] > 0:
+        ac /= ac[0]
+    return ac
+
+
+def _generate_waveform(magnitude: np.ndarray) -> np.ndarray:
     """
     Generate waveform-like data from spectral analysis.
     60 data points representing energy across frequency bands.
@@ -151,29 +156,24 @@ def _generate_waveform(magnitude: np.ndarray) -> list:
     max_radius = min(center_y, center_x)
     band_width = max_radius / n_points
 
-    waveform = []
-    for i in range(n_points):
-        r_inner = i * band_width
-        r_outer = (i + 1) * band_width
-
-        # Create radial mask
-        y_coords, x_coords = np.ogrid[:h, :w]
-        distances = np.sqrt((y_coords - center_y) ** 2 + (x_coords - center_x) ** 2)
-        mask = (distances >= r_inner) & (distances < r_outer)
+    # Radial band index of every pixel, computed once
+    y_coords, x_coords = np.ogrid[:h, :w]
+    distances = np.sqrt((y_coords - center_y) ** 2 + (x_coords - center_x) ** 2)
+    bins = (distances / band_width).astype(np.int32).ravel()
 
-        if np.any(mask):
-            band_energy = float(np.mean(magnitude[mask]))
-        else:
-            band_energy = 0.0
+    # Corners beyond max_radius fall outside every band
+    inside = bins < n_points
+    bins = bins[inside]
 
-        # Normalize to 0-1 range
-        waveform.append(band_energy)
+    # Mean magnitude per band in a single pass
+    sums = np.bincount(bins, weights=magnitude.ravel()[inside], minlength=n_points)
+    counts = np.bincount(bins, minlength=n_points)
+    waveform = sums / np.maximum(counts, 1)
 
-    # Normalize
-    max_val = max(waveform) if max(waveform) > 0 else 1.0
-    waveform = [round(v / max_val, 4) for v in waveform]
+    # Normalize to 0-1 range
+    max_val = waveform.max() if waveform.max() > 0 else 1.0
 
-    return waveform
+    return np.round(waveform / max_val, 4)
 
 
 def _generate_spectral_correlation(magnitude: np.ndarray) -> list:
@@ -184,32 +184,21 @@ def _generate_spectral_correlation(magnitude: np.ndarray) -> list:
     h, w = magnitude.shape
     n_points = 30
 
-    data = []
     step_h = h // n_points
     step_w = w // n_points
+    row_idx = np.minimum(np.arange(n_points) * step_h, h - 1)
+    col_idx = np.minimum(np.arange(n_points) * step_w, w - 1)
 
-    for t in range(n_points):
-        # "Visual" signal: horizontal frequency profile
-        row_idx = min(t * step_h, h - 1)
-        visual = float(np.mean(magnitude[row_idx, :]))
-
-        # "Audio" signal: vertical frequency profile
-        col_idx = min(t * step_w, w - 1)
-        audio = float(np.mean(magnitude[:, col_idx]))
-
-        # Normalize
-        data.append({
-            "time": t,
-            "visual": visual,
-            "audio": audio,
-        })
+    # "Visual" signal: horizontal frequency profile of sampled rows
+    visual = magnitude[row_idx, :].mean(axis=1, dtype=np.float64)
+    # "Audio" signal: vertical frequency profile of sampled columns
+    audio = magnitude[:, col_idx].mean(axis=0, dtype=np.float64)
 
     # Normalize all values to 0-1
-    max_visual = max((d["visual"] for d in data), default=1.0) or 1.0
-    max_audio = max((d["audio"] for d in data), default=1.0) or 1.0
-
-    for d in data:
-        d["visual"] = round(d["visual"] / max_visual, 4)
-        d["audio"] = round(d["audio"] / max_audio, 4)
+    visual = np.round(visual / (visual.max() or 1.0), 4)
+    audio = np.round(audio / (audio.max() or 1.0), 4)
 
-    return data
+    return [
+        {"time": t, "visual": v, "audio": a}
+        for t, (v, a) in enumerate(zip(visual.tolist(), audio.tolist()))
+    ]
@@ -7,28 +7,71 @@ FastAPI backend that performs actual deepfake detection using:
 3. Frequency domain analysis (DCT) — GAN artifact detection
 4. Hugging Face AI classification — ViT deepfake vs real model
 
-Run:  cd backend && ../backend/venv/bin/python server.py
+Run:  python -m backend.server   (from the repository root)
 """
 
+import os
+
+# One native thread per detector call: parallelism comes from the worker
+# processes and _DETECTOR_POOL, and nested OpenMP/BLAS pools on top of them
+# oversubscribe the cores. Must be set before NumPy/OpenCV/PyTorch load.
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import asyncio
 import hashlib
 import time
 import io
-import sys
-import os
-
+import math
+import ssl
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
+
+import cv2
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-# Add parent to path for imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from backend.detectors.face_detector import detect_faces, detect_faces_batch
+from backend.detectors.ela_analyzer import analyze_ela
+from backend.detectors.frequency_analyzer import analyze_frequency
+from backend.detectors.ai_classifier import classify_deepfake, _load_model
+from backend.detectors._decode import decode
+
+cv2.setNumThreads(1)
+
+# Detectors release the GIL in OpenCV/NumPy/PyTorch, so they run side by side.
+# A single process sizes the pool to the machine; the multi-worker entry point
+# below gives each worker its share of the cores via DT_DETECTOR_THREADS.
+_DETECTOR_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("DT_DETECTOR_THREADS", max(4, os.cpu_count() or 1))),
+    thread_name_prefix="detector",
+)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse serialized with orjson; numpy values are encoded natively."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # SHA-256 of uploads goes through OpenSSL (SHA-NI on recent x86 builds)
+    print(f"[Server] Hashing with {ssl.OPENSSL_VERSION}")
+    # Load XceptionNet up front so the first requests don't queue behind it
+    try:
+        _load_model()
+    except Exception as e:
+        print(f"[Server] XceptionNet preload failed, will retry per request: {e}")
+    yield
 
-from detectors.face_detector import detect_faces
-from detectors.ela_analyzer import analyze_ela
-from detectors.frequency_analyzer import analyze_frequency
-from detectors.ai_classifier import classify_deepfake
 
-app = FastAPI(title="DeepTrust Detection API", version="2.0")
+app = FastAPI(title="DeepTrust Detection API", version="2.0", lifespan=lifespan)
 
 # Allow Next.js frontend to call us
 app.add_middleware(
@@ -42,7 +85,39 @@ app.add_middleware(
 ALLOWED_TYPES = {"image/jpeg", "image/png", "image/webp", "image/bmp", "image/gif",
                  "video/mp4", "video/webm", "video/avi", "video/quicktime",
                  "audio/mpeg", "audio/wav", "audio/ogg", "audio/mp3"}
+_ALLOWED_PREFIXES = frozenset(t.split("/")[0] for t in ALLOWED_TYPES)
 MAX_SIZE = 100 * 1024 * 1024  # 100 MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+# Idle upload buffers, reused across requests so typical uploads don't
+# allocate. They keep their high-water size; larger ones aren't pooled.
+# Only touched from the event loop.
+_UPLOAD_BUFFERS = []
+UPLOAD_POOL_SIZE = 8
+POOLED_BUFFER_MAX = 16 * 1024 * 1024  # 16 MB
+
+# Frames sampled per video; they are classified together as one batch
+VIDEO_FRAMES = 4
+
+# Placeholder payloads for detectors that didn't run (built once, never mutated)
+_ZERO_HEATMAP = tuple((0.0,) * 12 for _ in range(8))
+_ZERO_WAVEFORM = (0.0,) * 60
+_DEFAULT_CORRELATION = tuple({"time": t, "visual": 0.5, "audio": 0.5} for t in range(30))
+
+# Detector results for recently seen files, keyed by (sha256, content type).
+# Only touched from the event loop, so it needs no lock.
+_RESULT_CACHE = TTLCache(maxsize=512, ttl=3600)
+
+# XceptionNet fake-score bands used by the verdict. Outside
+# [AI_AUTHENTIC_BELOW, AI_MANIPULATED_ABOVE] the AI score alone decides it,
+# which is also when ELA/frequency may be skipped (see _is_decisive).
+AI_AUTHENTIC_BELOW = 0.30
+AI_SUSPICIOUS_ABOVE = 0.50
+AI_MANIPULATED_ABOVE = 0.75
+
+# DT_FAST_MODE=1 gates ELA/frequency on the AI score for images as well
+# (video frames always are); see _run_image_detectors.
+FAST_MODE = os.environ.get("DT_FAST_MODE") == "1"
 
 
 @app.get("/health")
@@ -60,57 +135,28 @@ async def analyze_file(file: UploadFile = File(...)):
 
     # Validate content type
     content_type = file.content_type or ""
-    if not any(content_type.startswith(t.split("/")[0]) for t in ALLOWED_TYPES):
+    if content_type.split("/", 1)[0] not in _ALLOWED_PREFIXES:
         raise HTTPException(400, f"Unsupported file type: {content_type}")
 
-    # Read file
-    contents = await file.read()
-    if len(contents) > MAX_SIZE:
-        raise HTTPException(400, f"File too large: {len(contents) / 1e6:.1f} MB (max 100 MB)")
-
-    if len(contents) == 0:
-        raise HTTPException(400, "Empty file uploaded")
-
-    # Compute file hash
-    file_hash = hashlib.sha256(contents).hexdigest()
-
-    # Determine media type
-    is_image = content_type.startswith("image/")
-    is_video = content_type.startswith("video/")
-    is_audio = content_type.startswith("audio/")
-
-    # Initialize results
-    face_result = {"face_count": 0, "faces": [], "detection_method": "none"}
-    ela_result = {"manipulation_score": 0.0, "heatmap_data": [[0.0] * 12 for _ in range(8)], "artifacts": []}
-    freq_result = {"spectral_anomaly": 0.0, "waveform_data": [0.0] * 60, "correlation_data": []}
-    ai_result = {"success": False, "label": "unknown", "confidence": 0.0, "real_score": 0.0, "fake_score": 0.0}
-
-    # ===== Run detectors =====
-    if is_image:
-        # Face detection
-        face_result = detect_faces(contents)
-
-        # Error Level Analysis
-        ela_result = analyze_ela(contents)
-
-        # Frequency analysis
-        freq_result = analyze_frequency(contents)
-
-        # AI Classification (Hugging Face)
-        ai_result = classify_deepfake(contents)
-
-    elif is_video:
-        # For video: extract a frame and analyze it
-        frame_bytes = _extract_video_frame(contents)
-        if frame_bytes:
-            face_result = detect_faces(frame_bytes)
-            ela_result = analyze_ela(frame_bytes)
-            freq_result = analyze_frequency(frame_bytes)
-            ai_result = classify_deepfake(frame_bytes)
-
-    elif is_audio:
-        # Audio: frequency analysis only
-        freq_result = analyze_frequency_from_audio(contents)
+    # Read file (hashed in the same pass) into a pooled buffer
+    buf = _UPLOAD_BUFFERS.pop() if _UPLOAD_BUFFERS else bytearray()
+    contents = None
+    try:
+        contents, file_hash = await _read_upload(file, buf)
+
+        if len(contents) == 0:
+            raise HTTPException(400, "Empty file uploaded")
+
+        # ===== Run detectors (reusing results for repeated uploads) =====
+        cache_key = (file_hash, content_type)
+        results = _RESULT_CACHE.get(cache_key)
+        if results is None:
+            results, complete = await _run_detectors(contents, content_type)
+            if complete:
+                _RESULT_CACHE[cache_key] = results
+    finally:
+        _release_upload_buffer(buf, contents)
+    face_result, ela_result, freq_result, ai_result = results
 
     # ===== Compute overall verdict =====
     verdict, confidence, explanation = _compute_verdict(
@@ -120,25 +166,37 @@ async def analyze_file(file: UploadFile = File(...)):
 
     processing_time = (time.time() - start_time) * 1000  # ms
 
+    # Skipped detectors only hold placeholders: send null instead of numbers
+    # that would read as measurements
+    ela_skipped = ela_result.get("skipped", False)
+    freq_skipped = freq_result.get("skipped", False)
+    ela_score = None if ela_skipped else round(ela_result.get("manipulation_score", 0.0), 4)
+    freq_score = None if freq_skipped else round(freq_result.get("spectral_anomaly", 0.0), 4)
+    sync_score = None
+    if not (ela_skipped or freq_skipped):
+        sync_score = round(1.0 - ela_result.get("manipulation_score", 0.0) * 0.5
+                           - freq_result.get("spectral_anomaly", 0.0) * 0.5, 4)
+
     # Format response to match frontend AnalysisResult interface
     response = {
         "verdict": verdict,
         "confidence": round(confidence, 4),
         "visual": {
-            "score": round(ela_result.get("manipulation_score", 0.0), 4),
+            "score": ela_score,
             "artifacts": ela_result.get("artifacts", []),
-            "heatmapData": ela_result.get("heatmap_data", [[0.0] * 12 for _ in range(8)]),
+            "heatmapData": None if ela_skipped else ela_result.get("heatmap_data", _ZERO_HEATMAP),
+            "skipped": ela_skipped,
         },
         "audio": {
-            "score": round(freq_result.get("spectral_anomaly", 0.0), 4),
-            "spectralAnomaly": round(freq_result.get("spectral_anomaly", 0.0), 4),
-            "waveformData": freq_result.get("waveform_data", [0.0] * 60),
+            "score": freq_score,
+            "spectralAnomaly": freq_score,
+            "waveformData": None if freq_skipped else freq_result.get("waveform_data", _ZERO_WAVEFORM),
+            "skipped": freq_skipped,
         },
         "crossModal": {
-            "syncScore": round(1.0 - ela_result.get("manipulation_score", 0.0) * 0.5
-                              - freq_result.get("spectral_anomaly", 0.0) * 0.5, 4),
-            "correlationData": freq_result.get("correlation_data",
-                [{"time": t, "visual": 0.5, "audio": 0.5} for t in range(30)]),
+            "syncScore": sync_score,
+            "correlationData": freq_result.get("correlation_data", _DEFAULT_CORRELATION),
+            "skipped": ela_skipped or freq_skipped,
         },
         "blockchain": {
             "found": False,
@@ -164,7 +222,48 @@ async def analyze_file(file: UploadFile = File(...)):
         },
     }
 
-    return JSONResponse(content=response)
+    return ORJSONResponse(content=response)
+
+
+async def _read_upload(file: UploadFile, buf: bytearray) -> tuple:
+    """
+    Stream the upload into `buf` in chunks, rejecting it as soon as it
+    exceeds MAX_SIZE, and compute its SHA-256 along the way. `buf` may be a
+    reused buffer: it is overwritten in place and only grows when needed.
+    Returns (zero-copy view of the data, hex digest).
+    """
+    if file.size is not None and file.size > MAX_SIZE:
+        # Round up so a file just over the limit never reads as "100.0 MB"
+        size_mb = math.ceil(file.size * 10 / 2**20) / 10
+        raise HTTPException(400, f"File too large: {size_mb:.1f} MB (max {MAX_SIZE // 2**20} MB)")
+
+    size = 0
+    digest = hashlib.sha256()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        end = size + len(chunk)
+        if end > MAX_SIZE:
+            raise HTTPException(400, f"File too large: over the {MAX_SIZE // 2**20} MB limit")
+        if end <= len(buf):
+            buf[size:end] = chunk
+        else:
+            buf[size:] = chunk
+        digest.update(chunk)
+        size = end
+    return memoryview(buf)[:size], digest.hexdigest()
+
+
+def _release_upload_buffer(buf: bytearray, view) -> None:
+    """Return an upload buffer to the pool once nothing references its data."""
+    if view is not None:
+        try:
+            view.release()
+        except BufferError:
+            return  # Still exported (e.g. held by a traceback); let GC free it
+    if len(_UPLOAD_BUFFERS) < UPLOAD_POOL_SIZE and len(buf) <= POOLED_BUFFER_MAX:
+        _UPLOAD_BUFFERS.append(buf)
 
 
 def _compute_verdict(face_result, ela_result, freq_result, ai_result, filename, content_type):
@@ -173,16 +272,35 @@ def _compute_verdict(face_result, ela_result, freq_result, ai_result, filename,
     The AI forensic classifier is the primary signal, with ELA and frequency
     as supporting evidence.
     """
-    explanations = []
+    face_confs = [f.get("confidence", 0) for f in face_result.get("faces", [])]
+    verdict, confidence, explanation = _verdict_from_scores(
+        face_result.get("face_count", 0),
+        face_result.get("detection_method", "unknown"),
+        sum(face_confs) / len(face_confs) if face_confs else 0,
+        ela_result.get("manipulation_score", 0.0),
+        freq_result.get("spectral_anomaly", 0.0),
+        ai_result.get("success", False),
+        ai_result.get("label", "unknown"),
+        ai_result.get("confidence", 0.0),
+        ai_result.get("fake_score", 0.0),
+        ai_result.get("real_score", 0.0),
+        tuple(ai_result.get("details", [])[:2]),
+        content_type.startswith("image/") or content_type.startswith("video/"),
+        ela_result.get("skipped", False),
+    )
+    return verdict, confidence, "".join(('Analysis of "', filename, '": ', explanation))
+
 
-    face_count = face_result.get("face_count", 0)
-    ela_score = ela_result.get("manipulation_score", 0.0)
-    freq_score = freq_result.get("spectral_anomaly", 0.0)
-    ai_success = ai_result.get("success", False)
-    ai_label = ai_result.get("label", "unknown")
-    ai_confidence = ai_result.get("confidence", 0.0)
-    ai_fake_score = ai_result.get("fake_score", 0.0)
-    ai_real_score = ai_result.get("real_score", 0.0)
+@lru_cache(maxsize=4096)
+def _verdict_from_scores(face_count, face_method, avg_face_conf, ela_score, freq_score,
+                         ai_success, ai_label, ai_confidence, ai_fake_score, ai_real_score,
+                         ai_details, is_visual, forensics_skipped):
+    """
+    Verdict, confidence and explanation (without the filename) from the
+    detector scalars. Pure, so repeated scores (e.g. cached uploads) are
+    answered from the LRU cache.
+    """
+    explanations = []
 
     # --- AI Classification (primary signal) ---
     if ai_success:
@@ -190,7 +308,7 @@ def _compute_verdict(face_result, ela_result, freq_result, ai_result, filename,
             explanations.append(
                 f"Forensic AI analysis detected deepfake/GAN artifacts "
                 f"(fake score: {ai_fake_score*100:.1f}%, confidence: {ai_confidence*100:.1f}%). "
-                f"Analysis found: {'; '.join(ai_result.get('details', [])[:2])}"
+                f"Analysis found: {'; '.join(ai_details)}"
             )
         elif ai_label == "real":
             explanations.append(
@@ -205,40 +323,47 @@ def _compute_verdict(face_result, ela_result, freq_result, ai_result, filename,
     else:
         explanations.append("AI forensic classifier unavailable; using basic forensics only.")
 
+    # Extreme AI scores settle the verdict outright — skip the supporting-evidence text
+    if ai_success and (ai_fake_score > 0.95 or ai_fake_score < 0.05):
+        verdict, confidence = _ai_verdict(ai_fake_score)
+        return verdict, confidence, explanations[0]
+
     # --- Face Detection ---
-    if content_type.startswith("image/") or content_type.startswith("video/"):
+    if is_visual:
         if face_count > 0:
-            face_confs = [f.get("confidence", 0) for f in face_result.get("faces", [])]
-            avg_face_conf = sum(face_confs) / len(face_confs) if face_confs else 0
             explanations.append(
-                f"Detected {face_count} face(s) via {face_result.get('detection_method', 'unknown')} "
+                f"Detected {face_count} face(s) via {face_method} "
                 f"(avg confidence {avg_face_conf*100:.1f}%)."
             )
         else:
             explanations.append("No faces detected in the media.")
 
     # --- ELA ---
-    if ela_score > 0.4:
+    ela_pct = f"{ela_score * 100:.1f}%"
+    if forensics_skipped:
+        explanations.append("ELA and spectral analysis skipped: the AI score is decisive.")
+    elif ela_score > 0.4:
         explanations.append(
-            f"Error Level Analysis flagged manipulation indicators (score: {ela_score*100:.1f}%)."
+            f"Error Level Analysis flagged manipulation indicators (score: {ela_pct})."
         )
     elif ela_score > 0.15:
         explanations.append(
-            f"ELA shows minor re-encoding artifacts ({ela_score*100:.1f}%)."
+            f"ELA shows minor re-encoding artifacts ({ela_pct})."
         )
     else:
         explanations.append(
-            f"ELA shows consistent error levels ({ela_score*100:.1f}%) — no JPEG-level tampering."
+            f"ELA shows consistent error levels ({ela_pct}) — no JPEG-level tampering."
         )
 
     # --- Frequency Analysis ---
+    freq_pct = f"{freq_score * 100:.1f}%"
     if freq_score > 0.4:
         explanations.append(
-            f"Spectral analysis detected anomalous frequency patterns ({freq_score*100:.1f}%)."
+            f"Spectral analysis detected anomalous frequency patterns ({freq_pct})."
         )
     elif freq_score > 0.15:
         explanations.append(
-            f"Spectral analysis shows minor irregularities ({freq_score*100:.1f}%)."
+            f"Spectral analysis shows minor irregularities ({freq_pct})."
         )
 
     # ===== COMPUTE FINAL VERDICT =====
@@ -248,24 +373,7 @@ def _compute_verdict(face_result, ela_result, freq_result, ai_result, filename,
 
     if ai_success:
         # XceptionNet drives the verdict — use fake_score directly
-        fs = ai_fake_score
-
-        # Thresholds tuned for XceptionNet:
-        #   fake_score > 0.75 → manipulated (model is very confident)
-        #   fake_score 0.50-0.75 → suspicious (borderline, could be false positive)
-        #   fake_score < 0.50 → authentic
-        if fs > 0.75:
-            verdict = "manipulated"
-            confidence = min(0.99, 0.5 + fs * 0.49)
-        elif fs > 0.50:
-            verdict = "suspicious"
-            confidence = min(0.85, 0.5 + (fs - 0.5) * 1.0)
-        elif fs < 0.30:
-            verdict = "authentic"
-            confidence = min(0.99, 0.6 + (1.0 - fs) * 0.35)
-        else:
-            verdict = "uncertain"
-            confidence = min(0.70, 0.5 + abs(fs - 0.4) * 0.5)
+        verdict, confidence = _ai_verdict(ai_fake_score)
     else:
         # No AI classifier — fall back to ELA + frequency only
         combined = ela_score * 0.5 + freq_score * 0.5
@@ -276,45 +384,240 @@ def _compute_verdict(face_result, ela_result, freq_result, ai_result, filename,
             verdict = "authentic"
             confidence = min(0.99, 0.6 + (1.0 - combined) * 0.2)
 
-    # Build final explanation
-    full_explanation = f'Analysis of "{filename}": ' + " ".join(explanations)
+    return verdict, confidence, " ".join(explanations)
 
-    return verdict, confidence, full_explanation
 
+def _ai_verdict(fs: float) -> tuple:
+    """Verdict and confidence from the XceptionNet fake score alone."""
+    # Thresholds tuned for XceptionNet:
+    #   fake_score > 0.75 → manipulated (model is very confident)
+    #   fake_score 0.50-0.75 → suspicious (borderline, could be false positive)
+    #   fake_score 0.30-0.50 → uncertain
+    #   fake_score < 0.30 → authentic
+    if fs > AI_MANIPULATED_ABOVE:
+        return "manipulated", min(0.99, 0.5 + fs * 0.49)
+    if fs > AI_SUSPICIOUS_ABOVE:
+        return "suspicious", min(0.85, 0.5 + (fs - 0.5) * 1.0)
+    if fs < AI_AUTHENTIC_BELOW:
+        return "authentic", min(0.99, 0.6 + (1.0 - fs) * 0.35)
+    return "uncertain", min(0.70, 0.5 + abs(fs - 0.4) * 0.5)
+
+
+async def _run_detectors(contents, content_type: str) -> tuple:
+    """
+    Run the detectors for the upload's media type.
+    Returns ((face, ela, freq, ai) results, whether every detector succeeded).
+    Detectors mostly report failures as an "error" key rather than raising,
+    so those (and an AI classifier that didn't succeed) count as failed too.
+    """
+    # Determine media type
+    is_image = content_type.startswith("image/")
+    is_video = content_type.startswith("video/")
+    is_audio = content_type.startswith("audio/")
+
+    # Initialize results
+    face_result = {"face_count": 0, "faces": [], "detection_method": "none"}
+    ela_result = {"manipulation_score": 0.0, "heatmap_data": _ZERO_HEATMAP, "artifacts": []}
+    freq_result = {"spectral_anomaly": 0.0, "waveform_data": _ZERO_WAVEFORM, "correlation_data": []}
+    ai_result = {"success": False, "label": "unknown", "confidence": 0.0, "real_score": 0.0, "fake_score": 0.0}
+
+    detected = None
+    if is_image:
+        detected = await _run_image_detectors(contents, gated=FAST_MODE)
+
+    elif is_video:
+        # For video: extract several frames and analyze them as a batch
+        loop = asyncio.get_running_loop()
+        frames = await loop.run_in_executor(_DETECTOR_POOL, _extract_video_frames, contents)
+        if frames:
+            detected = await _run_video_detectors(frames)
+
+    elif is_audio:
+        # Audio: frequency analysis only
+        freq_result = analyze_frequency_from_audio(contents)
+
+    defaults = (face_result, ela_result, freq_result, ai_result)
+    if detected is None:
+        return defaults, "error" not in freq_result
+
+    # Keep the default result for any detector that raised or was skipped
+    failed = False
+    for result in detected:
+        if isinstance(result, Exception):
+            print(f"[Server] Detector failed: {result!r}")
+            failed = True
+    results = []
+    for result, default in zip(detected, defaults):
+        if result is None:
+            results.append({**default, "skipped": True})
+        elif isinstance(result, Exception):
+            results.append(default)
+        else:
+            results.append(result)
+    results = tuple(results)
+    failed = failed or any("error" in result for result in results)
+    return results, not failed and results[3].get("success", False)
+
+
+async def _run_image_detectors(image_bytes: bytes, gated: bool = False):
+    """
+    Run face detection, ELA, frequency analysis and AI classification on one
+    image concurrently in the detector pool, off the event loop. The AI
+    classifier waits for the face boxes; ELA and frequency run alongside.
+    With gated=True, ELA and frequency only run once the AI score turns out
+    to be borderline, since a decisive score alone fixes the verdict.
+    Returns [face_result, ela_result, freq_result, ai_result], with the
+    exception object in place of any detector that raised and None for
+    skipped ones.
+    """
+    loop = asyncio.get_running_loop()
+
+    def run(fn, *args, **kwargs):
+        return loop.run_in_executor(_DETECTOR_POOL, partial(fn, *args, **kwargs))
+
+    # Decode once and share the pixels with every detector
+    decoded = await run(_decode_or_none, image_bytes)
+
+    face_task = run(detect_faces, image_bytes, decoded=decoded)
+
+    async def classify_after_faces():
+        try:
+            boxes = _face_boxes(await face_task)
+        except Exception:
+            boxes = None  # Classifier falls back to its own face detection
+        return await run(classify_deepfake, image_bytes, decoded=decoded, faces=boxes)
+
+    if not gated:
+        return await asyncio.gather(
+            face_task,
+            run(analyze_ela, image_bytes, decoded=decoded),
+            run(analyze_frequency, image_bytes, decoded=decoded),
+            classify_after_faces(),
+            return_exceptions=True,
+        )
+
+    face_result, ai_result = await asyncio.gather(
+        face_task, classify_after_faces(), return_exceptions=True
+    )
+    if _is_decisive(ai_result):
+        return [face_result, None, None, ai_result]
+    ela_result, freq_result = await asyncio.gather(
+        run(analyze_ela, image_bytes, decoded=decoded),
+        run(analyze_frequency, image_bytes, decoded=decoded),
+        return_exceptions=True,
+    )
+    return [face_result, ela_result, freq_result, ai_result]
 
-def _extract_video_frame(video_bytes: bytes):
-    """Extract the first frame from a video for analysis."""
-    import cv2
-    import numpy as np
-    import tempfile
+
+async def _run_video_detectors(frames: list):
+    """
+    Detect faces on every extracted frame and classify all frames in one
+    XceptionNet batch. ELA and frequency analysis then run on the most
+    suspicious frame, and only if the averaged AI score is borderline (as in
+    gated image runs). Returns [face_result, ela_result, freq_result,
+    ai_result] like _run_image_detectors, reporting faces for that frame.
+    """
+    loop = asyncio.get_running_loop()
+
+    def run(fn, *args, **kwargs):
+        return loop.run_in_executor(_DETECTOR_POOL, partial(fn, *args, **kwargs))
+
+    decoded = await run(_decode_frames, frames)
 
     try:
-        # Write video to temp file (OpenCV needs a file path)
-        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as f:
-            f.write(video_bytes)
-            temp_path = f.name
+        face_results = await run(detect_faces_batch, frames, decoded=decoded)
+    except Exception as e:
+        face_results = [e] * len(frames)
+    boxes = [None if isinstance(r, Exception) else _face_boxes(r) for r in face_results]
 
-        cap = cv2.VideoCapture(temp_path)
+    try:
+        ai_result = await run(classify_deepfake, frames, decoded=decoded, faces=boxes)
+    except Exception as e:
+        ai_result = e
+
+    index = ai_result.get("frame_index", 0) if isinstance(ai_result, dict) else 0
+    if _is_decisive(ai_result):
+        return [face_results[index], None, None, ai_result]
+    ela_result, freq_result = await asyncio.gather(
+        run(analyze_ela, frames[index], decoded=decoded[index]),
+        run(analyze_frequency, frames[index], decoded=decoded[index]),
+        return_exceptions=True,
+    )
+    return [face_results[index], ela_result, freq_result, ai_result]
 
-        # Try to get a frame from 1 second in
-        fps = cap.get(cv2.CAP_PROP_FPS) or 30
-        cap.set(cv2.CAP_PROP_POS_FRAMES, int(fps))
 
-        ret, frame = cap.read()
-        if not ret:
-            # Fallback to first frame
-            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, frame = cap.read()
+def _decode_frames(frames: list) -> list:
+    """Decode every video frame once, with None for frames that fail."""
+    return [_decode_or_none(frame) for frame in frames]
 
-        cap.release()
-        os.unlink(temp_path)
 
-        if ret and frame is not None:
-            _, buffer = cv2.imencode(".jpg", frame)
-            return buffer.tobytes()
+def _decode_or_none(image_bytes: bytes):
+    """Decode once for all detectors; on failure each detector reports its own error."""
+    try:
+        return decode(image_bytes)
+    except ValueError:
+        return None
+
+
+def _is_decisive(ai_result) -> bool:
+    """True if the AI score alone settles the verdict (see _ai_verdict)."""
+    if not isinstance(ai_result, dict) or not ai_result.get("success", False):
+        return False
+    fake_score = ai_result.get("fake_score", 0.0)
+    return fake_score < AI_AUTHENTIC_BELOW or fake_score > AI_MANIPULATED_ABOVE
+
+
+def _face_boxes(face_result):
+    """(x, y, w, h) boxes from detect_faces, or None if detection didn't run."""
+    if "error" in face_result:
+        return None
+    return [(f["bbox"]["x"], f["bbox"]["y"], f["bbox"]["w"], f["bbox"]["h"])
+            for f in face_result.get("faces", [])]
+
+
+def _extract_video_frames(video_bytes: bytes, count: int = VIDEO_FRAMES) -> list:
+    """
+    Extract `count` evenly spaced frames from a video for analysis, decoded
+    in memory. Returns them as JPEG bytes (empty list if undecodable).
+    """
+    import av
+
+    frames = []
+    try:
+        with av.open(io.BytesIO(video_bytes)) as container:
+            stream = container.streams.video[0]
+            start = stream.start_time or 0
+            if stream.duration:
+                duration = stream.duration
+            elif container.duration:
+                duration = int(container.duration / av.time_base / stream.time_base)
+            else:
+                duration = 2 * int(1 / stream.time_base)  # Unknown: sample around 1 s
+
+            # Interior timestamps, skipping the very first/last frames
+            for i in range(count):
+                frame = _decode_frame_at(container, stream, start + duration * (i + 1) // (count + 1))
+                if frame is not None:
+                    frames.append(frame)
+
+            if not frames:
+                # Fallback to first frame
+                container.seek(0, stream=stream)
+                frame = next(container.decode(stream), None)
+                if frame is not None:
+                    frames.append(frame)
+
+        return [cv2.imencode(".jpg", frame.to_ndarray(format="bgr24"))[1].tobytes() for frame in frames]
     except Exception:
-        pass
+        return []
 
+
+def _decode_frame_at(container, stream, target: int):
+    """Seek to the keyframe before `target` (stream time base), then decode up to it."""
+    container.seek(target, stream=stream)
+    for frame in container.decode(stream):
+        if frame.pts is not None and frame.pts >= target:
+            return frame
     return None
 
 
@@ -329,9 +632,9 @@ def analyze_frequency_from_audio(audio_bytes: bytes):
         if len(data) == 0:
             raise ValueError("Empty audio data")
 
-        # Compute spectral features
-        fft = np.fft.fft(data)
-        magnitude = np.abs(fft[:len(fft)//2])
+        # Compute spectral features (real-input FFT; drop the Nyquist bin so
+        # the bins match the positive half of a full FFT)
+        magnitude = np.abs(np.fft.rfft(data)[:len(data) // 2])
 
         if len(magnitude) == 0:
             raise ValueError("Empty FFT")
@@ -339,11 +642,11 @@ def analyze_frequency_from_audio(audio_bytes: bytes):
         # Normalize
         max_mag = magnitude.max() or 1.0
 
-        # Generate waveform (60 points)
+        # Generate waveform (60 points, zero-padded for short inputs)
         step = max(1, len(magnitude) // 60)
-        waveform = [round(float(magnitude[i * step] / max_mag), 4) for i in range(min(60, len(magnitude) // step))]
-        while len(waveform) < 60:
-            waveform.append(0.0)
+        idx = np.arange(min(60, len(magnitude) // step)) * step
+        waveform_arr = np.zeros(60)
+        waveform_arr[:len(idx)] = np.round(magnitude[idx] / max_mag, 4)
 
         # Spectral anomaly based on energy distribution
         low = np.mean(magnitude[:len(magnitude)//4])
@@ -352,14 +655,17 @@ def analyze_frequency_from_audio(audio_bytes: bytes):
 
         return {
             "spectral_anomaly": round(anomaly, 4),
-            "waveform_data": waveform,
-            "correlation_data": [{"time": t, "visual": 0.5, "audio": round(waveform[t*2] if t*2 < len(waveform) else 0.0, 4)} for t in range(30)],
+            "waveform_data": waveform_arr,
+            "correlation_data": [
+                {"time": t, "visual": 0.5, "audio": audio}
+                for t, audio in enumerate(waveform_arr[::2].tolist())
+            ],
         }
     except Exception as e:
         return {
             "spectral_anomaly": 0.0,
-            "waveform_data": [0.0] * 60,
-            "correlation_data": [{"time": t, "visual": 0.5, "audio": 0.5} for t in range(30)],
+            "waveform_data": _ZERO_WAVEFORM,
+            "correlation_data": _DEFAULT_CORRELATION,
             "error": str(e),
         }
 
@@ -372,4 +678,20 @@ if __name__ == "__main__":
     print("   Frequency: DCT Spectral Analysis")
     print("   AI: Hugging Face ViT Classifier")
     print()
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One process per core (each loads its own model); DT_WORKERS overrides.
+    workers = int(os.environ.get("DT_WORKERS", max(2, os.cpu_count() or 1)))
+    # Split the cores between workers (the worker processes inherit this).
+    # Keep at least 2 threads so concurrent requests can still share an
+    # XceptionNet batch while one detector thread waits on it.
+    os.environ.setdefault(
+        "DT_DETECTOR_THREADS", str(max(2, (os.cpu_count() or 1) // workers))
+    )
+    # "auto" picks uvloop/httptools when installed (uvicorn[standard]).
+    uvicorn.run(
+        "backend.server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="auto",
+        http="auto",
+    )
@@ -4,14 +4,19 @@ import { Progress } from "@/components/ui/progress"
 
 interface AudioAnalysisPanelProps {
   data: {
-    score: number
-    spectralAnomaly: number
-    waveformData: number[]
+    score: number | null
+    spectralAnomaly: number | null
+    waveformData: number[] | null
+    skipped?: boolean
   }
 }
 
 export function AudioAnalysisPanel({ data }: AudioAnalysisPanelProps) {
-  const maxVal = Math.max(...data.waveformData, 0.01)
+  const waveform = data.waveformData ?? []
+  const maxVal = Math.max(...waveform, 0.01)
+
+  const formatScore = (value: number | null) =>
+    value === null ? "Skipped" : `${(value * 100).toFixed(1)}%`
 
   return (
     <div className="grid gap-6 lg:grid-cols-2">
@@ -21,7 +26,12 @@ export function AudioAnalysisPanel({ data }: AudioAnalysisPanelProps) {
           Audio Waveform
         </h4>
         <div className="flex h-40 items-end gap-[2px] rounded-lg border border-border bg-secondary/30 p-3">
-          {data.waveformData.map((val, i) => {
+          {data.skipped && (
+            <p className="m-auto text-sm text-muted-foreground">
+              Spectral analysis was skipped: the AI classifier score was decisive.
+            </p>
+          )}
+          {waveform.map((val, i) => {
             const height = (val / maxVal) * 100
             const isAnomaly = i > 35 && i < 42
             return (
@@ -53,21 +63,17 @@ export function AudioAnalysisPanel({ data }: AudioAnalysisPanelProps) {
           <div>
             <div className="mb-2 flex items-center justify-between text-xs text-muted-foreground">
               <span>Synthetic Voice Score</span>
-              <span className="font-mono">
-                {(data.score * 100).toFixed(1)}%
-              </span>
+              <span className="font-mono">{formatScore(data.score)}</span>
             </div>
-            <Progress value={data.score * 100} className="h-2" />
+            <Progress value={(data.score ?? 0) * 100} className="h-2" />
           </div>
 
           <div>
             <div className="mb-2 flex items-center justify-between text-xs text-muted-foreground">
               <span>Spectral Anomaly Index</span>
-              <span className="font-mono">
-                {(data.spectralAnomaly * 100).toFixed(1)}%
-              </span>
+              <span className="font-mono">{formatScore(data.spectralAnomaly)}</span>
             </div>
-            <Progress value={data.spectralAnomaly * 100} className="h-2" />
+            <Progress value={(data.spectralAnomaly ?? 0) * 100} className="h-2" />
           </div>
 
           <div className="rounded-lg border border-border bg-secondary/30 p-4">
@@ -14,12 +14,15 @@ import {
 
 interface CrossModalPanelProps {
   data: {
-    syncScore: number
+    syncScore: number | null
     correlationData: { time: number; visual: number; audio: number }[]
+    skipped?: boolean
   }
 }
 
 export function CrossModalPanel({ data }: CrossModalPanelProps) {
+  const syncScore = data.syncScore
+
   return (
     <div className="grid gap-6 lg:grid-cols-2">
       {/* Correlation chart */}
@@ -99,14 +102,16 @@ export function CrossModalPanel({ data }: CrossModalPanelProps) {
             <div className="mb-2 flex items-center justify-between text-xs text-muted-foreground">
               <span>Lip-Sync Score</span>
               <span className="font-mono">
-                {(data.syncScore * 100).toFixed(1)}%
+                {syncScore === null ? "Skipped" : `${(syncScore * 100).toFixed(1)}%`}
               </span>
             </div>
-            <Progress value={data.syncScore * 100} className="h-2" />
+            <Progress value={(syncScore ?? 0) * 100} className="h-2" />
             <p className="mt-2 text-xs text-muted-foreground">
-              {data.syncScore > 0.7
-                ? "Audio and visual streams are well-synchronized."
-                : "Significant desynchronization detected between audio and visual streams."}
+              {syncScore === null
+                ? "Not measured: visual and spectral analysis were skipped because the AI classifier score was decisive."
+                : syncScore > 0.7
+                  ? "Audio and visual streams are well-synchronized."
+                  : "Significant desynchronization detected between audio and visual streams."}
             </p>
           </div>
 
@@ -124,7 +129,7 @@ export function CrossModalPanel({ data }: CrossModalPanelProps) {
           <div className="grid grid-cols-2 gap-3">
             <div className="rounded-lg border border-border bg-secondary/30 p-3 text-center">
               <div className="text-lg font-bold text-primary font-mono">
-                {data.syncScore > 0.7 ? "< 40ms" : "~120ms"}
+                {syncScore === null ? "n/a" : syncScore > 0.7 ? "< 40ms" : "~120ms"}
               </div>
               <div className="text-xs text-muted-foreground">Avg. Offset</div>
             </div>
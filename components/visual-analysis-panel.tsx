@@ -4,9 +4,10 @@ import { Progress } from "@/components/ui/progress"
 
 interface VisualAnalysisPanelProps {
   data: {
-    score: number
+    score: number | null
     artifacts: { region: string; severity: number }[]
-    heatmapData: number[][]
+    heatmapData: number[][] | null
+    skipped?: boolean
   }
 }
 
@@ -19,6 +20,8 @@ function getHeatColor(value: number): string {
 }
 
 export function VisualAnalysisPanel({ data }: VisualAnalysisPanelProps) {
+  const heatmap = data.heatmapData
+
   return (
     <div className="grid gap-6 lg:grid-cols-2">
       {/* Heatmap */}
@@ -27,17 +30,25 @@ export function VisualAnalysisPanel({ data }: VisualAnalysisPanelProps) {
           Artifact Heatmap
         </h4>
         <div className="aspect-video overflow-hidden rounded-lg border border-border bg-secondary/30">
-          <div className="grid h-full w-full grid-cols-12 grid-rows-8">
-            {data.heatmapData.flatMap((row, ri) =>
-              row.map((val, ci) => (
-                <div
-                  key={`${ri}-${ci}`}
-                  className={`${getHeatColor(val)} transition-colors`}
-                  title={`Intensity: ${(val * 100).toFixed(0)}%`}
-                />
-              ))
-            )}
-          </div>
+          {heatmap ? (
+            <div className="grid h-full w-full grid-cols-12 grid-rows-8">
+              {heatmap.flatMap((row, ri) =>
+                row.map((val, ci) => (
+                  <div
+                    key={`${ri}-${ci}`}
+                    className={`${getHeatColor(val)} transition-colors`}
+                    title={`Intensity: ${(val * 100).toFixed(0)}%`}
+                  />
+                ))
+              )}
+            </div>
+          ) : (
+            <div className="flex h-full items-center justify-center p-4 text-center">
+              <p className="text-sm text-muted-foreground">
+                Error level analysis was skipped: the AI classifier score was decisive.
+              </p>
+            </div>
+          )}
         </div>
         <div className="mt-3 flex items-center justify-between text-xs text-muted-foreground">
           <span>Low anomaly</span>
@@ -62,10 +73,10 @@ export function VisualAnalysisPanel({ data }: VisualAnalysisPanelProps) {
           <div className="mb-2 flex items-center justify-between text-xs text-muted-foreground">
             <span>Visual Manipulation Score</span>
             <span className="font-mono">
-              {(data.score * 100).toFixed(1)}%
+              {data.score === null ? "Skipped" : `${(data.score * 100).toFixed(1)}%`}
             </span>
           </div>
-          <Progress value={data.score * 100} className="h-2" />
+          <Progress value={(data.score ?? 0) * 100} className="h-2" />
         </div>
 
         {data.artifacts.length > 0 ? (
@@ -98,7 +109,9 @@ export function VisualAnalysisPanel({ data }: VisualAnalysisPanelProps) {
         ) : (
           <div className="flex flex-col items-center justify-center py-8 text-center">
             <p className="text-sm text-muted-foreground">
-              No significant visual artifacts detected.
+              {data.skipped
+                ? "Artifact analysis was not run for this file."
+                : "No significant visual artifacts detected."}
             </p>
           </div>
         )}
@@ -1,19 +1,23 @@
 export interface AnalysisResult {
   verdict: "authentic" | "manipulated" | "suspicious"
   confidence: number
+  // Scores are null when the backend skipped that analyzer (skipped: true)
   visual: {
-    score: number
+    score: number | null
     artifacts: { region: string; severity: number }[]
-    heatmapData: number[][]
+    heatmapData: number[][] | null
+    skipped?: boolean
   }
   audio: {
-    score: number
-    spectralAnomaly: number
-    waveformData: number[]
+    score: number | null
+    spectralAnomaly: number | null
+    waveformData: number[] | null
+    skipped?: boolean
   }
   crossModal: {
-    syncScore: number
+    syncScore: number | null
     correlationData: { time: number; visual: number; audio: number }[]
+    skipped?: boolean
   }
   blockchain: {
     found: boolean